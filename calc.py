@@ -1,4 +1,5 @@
 import sys # Imported for a clean exit, giving it a manually added touch
+import warnings
 
 # --- Core Arithmetic Functions ---
 
@@ -29,38 +30,143 @@ OPERATION_MAP = {
     '**': power_numbers, # Added a bonus operation for uniqueness!
 }
 
+# --- Batch Mode ---
+# The batch kernel can't call a dict of functions once compiled, so it
+# dispatches on these integer codes instead
+OPERATION_CODES = {
+    '+': 0,
+    '-': 1,
+    '*': 2,
+    '/': 3,
+    '**': 4,
+}
+
+_batch_kernel = None
+
+def load_batch_kernel():
+    """Imports NumPy (required) and Numba (optional) and builds the batch kernel."""
+    global _batch_kernel
+    if _batch_kernel is None:
+        import numpy as np
+        try:
+            from numba import njit, prange
+        except ImportError:
+            # Without Numba the kernel simply runs as plain Python
+            prange = range
+
+            def njit(*args, **kwargs):
+                return lambda func: func
+
+        @njit(cache=True, parallel=True)
+        def batch_evaluate(a, b, op_codes, out):
+            """Fills out[i] with a[i] <op> b[i] for every row, spread across threads."""
+            for i in prange(a.shape[0]):
+                op_code = op_codes[i]
+                if op_code == 0:
+                    out[i] = a[i] + b[i]
+                elif op_code == 1:
+                    out[i] = a[i] - b[i]
+                elif op_code == 2:
+                    out[i] = a[i] * b[i]
+                elif op_code == 3:
+                    # Can't raise from a parallel loop, so a zero divisor gives NaN instead
+                    out[i] = a[i] / b[i] if b[i] != 0.0 else np.nan
+                else:
+                    out[i] = a[i] ** b[i]
+
+        _batch_kernel = batch_evaluate
+    return _batch_kernel
+
 # --- Main Logic ---
 
+def run_batch(path):
+    """Evaluates every 'A,operation,B' line of a CSV file and prints the results."""
+    # NumPy and Numba are only imported here, so the interactive calculator
+    # starts instantly and never pays for them
+    try:
+        kernel = load_batch_kernel()
+    except ImportError:
+        print("Batch mode needs NumPy. Please install it and try again.")
+        return
+    import numpy as np
+
+    try:
+        # loadtxt warns about an empty file; we report that case ourselves below
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            rows = np.loadtxt(path, dtype=str, delimiter=',', ndmin=2)
+    except (OSError, ValueError) as e:
+        print(f"Could not read batch file: {e}")
+        return
+    if rows.size == 0:
+        print("The batch file has no calculations in it.")
+        return
+    if rows.shape[1] != 3:
+        print("Each line of the batch file must look like: A,operation,B")
+        return
+
+    operations = [op.strip() for op in rows[:, 1]]
+    unknown = [op for op in operations if op not in OPERATION_CODES]
+    if unknown:
+        print(f"'{unknown[0]}' is not a recognized operation. Nothing was calculated.")
+        return
+
+    try:
+        a = rows[:, 0].astype(np.float64)
+        b = rows[:, 2].astype(np.float64)
+    except ValueError as e:
+        print(f"Invalid number in batch file: {e}")
+        return
+    op_codes = np.array([OPERATION_CODES[op] for op in operations], dtype=np.int64)
+
+    out = np.empty_like(a)
+    kernel(a, b, op_codes, out)
+
+    # Build the whole report first and write it out in one go
+    lines = [
+        f"   {number_a} {operation} {number_b} = {result}\n"
+        for number_a, operation, number_b, result
+        in zip(a.tolist(), operations, b.tolist(), out.tolist())
+    ]
+    sys.stdout.write("".join(lines))
+
 def run_calculator():
     print("\n=== Advanced Simple Calculator ===")
     print("Available Operations: +, -, *, /, ** (Power)")
     print("Type 'exit' or 'quit' at any time to stop.")
 
+    # Bind the loop's globals and builtins to locals once, so each pass
+    # through the loop uses fast local lookups instead of global ones
+    op_map = OPERATION_MAP
+    _input = input
+    _float = float
+    _exit = sys.exit
+
     while True:
         # Get first number with error handling
         try:
-            input_a = input("Enter the first number (A): ").strip()
+            input_a = _input("Enter the first number (A): ").strip()
             if input_a.lower() in ('exit', 'quit'):
-                sys.exit(0)
-            number_a = float(input_a)
+                _exit(0)
+            number_a = _float(input_a)
         except ValueError:
             print("Invalid input for the first number. Please enter a valid numerical value.")
             continue # Go back to the start of the loop
 
         # Get operation choice
-        operation = input("Enter the operation symbol (+, -, *, /, **): ").strip()
+        operation = _input("Enter the operation symbol (+, -, *, /, **): ").strip()
         if operation.lower() in ('exit', 'quit'):
-            sys.exit(0)
-        if operation not in OPERATION_MAP:
+            _exit(0)
+        if operation not in op_map:
             print(f"'{operation}' is not a recognized operation. Please try again.")
             continue
 
         # Get second number with error handling
         try:
-            input_b = input("Enter the second number (B): ").strip()
+            input_b = _input("Enter the second number (B): ").strip()
             if input_b.lower() in ('exit', 'quit'):
-                sys.exit(0)
-            number_b = float(input_b)
+                _exit(0)
+            number_b = _float(input_b)
         except ValueError:
             print("Invalid input for the second number. Please enter a valid numerical value.")
             continue # Go back to the start of the loop
@@ -68,7 +174,7 @@ def run_calculator():
         # Perform the calculation
         try:
             # Retrieve the function from the map and call it with the numbers
-            calculation_function = OPERATION_MAP[operation]
+            calculation_function = op_map[operation]
             result = calculation_function(number_a, number_b)
 
             # Display the result formatted
@@ -82,7 +188,14 @@ def run_calculator():
 
 # Entry point
 if __name__ == "__main__":
-    try:
-        run_calculator()
-    except SystemExit:
-        print("\nCalculator closed. Thank you for using it!")
\ No newline at end of file
+    # Usage: python calc.py --batch expressions.csv
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        if len(sys.argv) == 3:
+            run_batch(sys.argv[2])
+        else:
+            print("Usage: python calc.py --batch expressions.csv")
+    else:
+        try:
+            run_calculator()
+        except SystemExit:
+            print("\nCalculator closed. Thank you for using it!")
\ No newline at end of file
@@ -1,59 +1,190 @@
+import atexit
 import csv
-import os
-import re  # Used for basic email and phone number format validation
+import io
+import re  # Used for basic email format validation
+import string
+import sys
+
+from storage import WriteBack, write_file
 
 # --- Configuration and Data Storage ---
 CONTACTS_FILE = "my_personal_contacts.csv"
 CONTACT_FIELDS = ['name', 'phone', 'email', 'address']
 
+# Validation pattern, compiled once instead of on every prompt
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+# Deletes every character a phone number may contain; anything left is invalid
+PHONE_STRIP_TABLE = str.maketrans('', '', string.digits + '()-' + string.whitespace)
+
+# --- Search Index ---
+# Lowercased names and normalized phones are computed once per contact, so a
+# search doesn't have to re-normalize every contact. Each contact gets a stable
+# key when it is indexed; keys count up in the order contacts join the list and
+# edits keep their key, so key order is always the list order.
+_search_entries = {}   # key -> (contact, lowercased name, normalized phone)
+_contact_keys = {}     # id(contact) -> key
+_next_key = 0
+# The contact list the index describes; add/update/delete keep it in step
+_indexed_list = None
+# Maps every 3-character window of the names and phones to the keys of the
+# contacts that contain it, so longer search terms only check a few candidates.
+_trigram_index = {}
+
 
 # --- Utility Functions ---
 
 def load_contacts():
     """Loads contacts from the CSV file into a list of dictionaries."""
     contacts_list = []
-    if not os.path.exists(CONTACTS_FILE):
-        return contacts_list
     try:
         with open(CONTACTS_FILE, mode='r', newline='', encoding='utf-8') as file:
-            # Use DictReader to automatically read rows into dictionaries
-            reader = csv.DictReader(file, fieldnames=CONTACT_FIELDS)
+            # A plain reader hands back lists, which we zip onto the field names
+            # ourselves; this is noticeably cheaper than DictReader on big files.
+            reader = csv.reader(file)
+            field_count = len(CONTACT_FIELDS)
+            header_checked = False
 
-            # Skip the header row if it exists (but ensure we don't skip actual data)
-            # Simple check: if the first item matches field names, skip it.
-            first_row = next(reader, None)
-            if first_row and first_row['name'] != 'name':
-                contacts_list.append(first_row)
-
-            # Add the rest of the rows
             for row in reader:
-                contacts_list.append(row)
-
+                if not row:
+                    continue  # Blank line, DictReader used to skip these too
+                # Skip the header row if it exists (but ensure we don't skip actual data)
+                # Simple check: if the first item matches field names, skip it.
+                if not header_checked:
+                    header_checked = True
+                    if row[0] == 'name':
+                        continue
+                if len(row) < field_count:
+                    row += [''] * (field_count - len(row))
+                contacts_list.append(dict(zip(CONTACT_FIELDS, row)))
+
+    except FileNotFoundError:
+        pass  # First run, nothing saved yet
     except Exception as e:
         print(f"Error loading contacts: {e}. Starting with an empty list.")
+    rebuild_search_index(contacts_list)
     return contacts_list
 
 
 def save_contacts(contacts_list):
     """Saves the current list of contacts to the CSV file, including a header."""
     try:
-        with open(CONTACTS_FILE, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=CONTACT_FIELDS)
+        # Build the whole CSV in memory first so the file gets a single write
+        buffer = io.StringIO(newline='')
+        writer = csv.DictWriter(buffer, fieldnames=CONTACT_FIELDS)
 
-            # Manually write the header row for clarity
-            writer.writeheader()
+        # Manually write the header row for clarity
+        writer.writeheader()
 
-            # Write all contacts
-            writer.writerows(contacts_list)
+        # Write all contacts
+        writer.writerows(contacts_list)
+        write_file(CONTACTS_FILE, buffer.getvalue().encode('utf-8'))
+        write_back.mark_clean()
         print("Contacts saved successfully to file.")
     except Exception as e:
         print(f"Critical Error: Could not save contacts! {e}")
 
 
+# Batches edits so the file is rewritten once per batch, not on every change
+write_back = WriteBack(save_contacts)
+
+
+# --- Search Index Helpers ---
+
+def normalize_phone(phone):
+    """Strips the spaces and dashes from a phone number so it can be searched."""
+    return phone.replace(' ', '').replace('-', '')
+
+
+def trigrams(text):
+    """Returns the set of 3-character windows found in the text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_trigrams(key, name, phone):
+    """Adds a contact's key under every trigram of its name and phone."""
+    for tri in trigrams(name) | trigrams(phone):
+        _trigram_index.setdefault(tri, set()).add(key)
+
+
+def unindex_trigrams(key, name, phone):
+    """Removes a contact's key from every trigram of its name and phone."""
+    for tri in trigrams(name) | trigrams(phone):
+        postings = _trigram_index.get(tri)
+        if postings is not None:
+            postings.discard(key)
+            if not postings:
+                del _trigram_index[tri]
+
+
+def rebuild_search_index(contacts_list):
+    """Recomputes the search index from scratch for the whole contact list."""
+    global _indexed_list
+    _indexed_list = contacts_list
+    _search_entries.clear()
+    _contact_keys.clear()
+    _trigram_index.clear()
+    for contact in contacts_list:
+        append_search_entry(contact)
+
+
+def ensure_search_index(contacts_list):
+    """Rebuilds the search index if it was built for a different contact list."""
+    # The index only describes the list it was built from
+    if contacts_list is not _indexed_list:
+        rebuild_search_index(contacts_list)
+
+
+def append_search_entry(contact):
+    """Indexes a newly appended contact under the next key."""
+    global _next_key
+    key = _next_key
+    _next_key += 1
+    name = contact['name'].lower()
+    phone = normalize_phone(contact['phone'])
+    _contact_keys[id(contact)] = key
+    _search_entries[key] = (contact, name, phone)
+    index_trigrams(key, name, phone)
+
+
+def replace_search_entry(contact):
+    """Refreshes the search values for a contact that was edited in place."""
+    key = _contact_keys[id(contact)]
+    _, old_name, old_phone = _search_entries[key]
+    unindex_trigrams(key, old_name, old_phone)
+    name = contact['name'].lower()
+    phone = normalize_phone(contact['phone'])
+    # Reassigning an existing key keeps its place in the dict's order
+    _search_entries[key] = (contact, name, phone)
+    index_trigrams(key, name, phone)
+
+
+def remove_search_entry(contact):
+    """Drops a contact removed from the list; no other contact is touched."""
+    key = _contact_keys.pop(id(contact))
+    _, name, phone = _search_entries.pop(key)
+    unindex_trigrams(key, name, phone)
+
+
+def find_matches(term):
+    """Returns the contacts whose name or phone contains the term, in list order."""
+    if len(term) < 3:
+        # Too short for a trigram lookup, fall back to scanning every entry
+        candidates = _search_entries.values()
+    else:
+        postings = [_trigram_index.get(tri) for tri in trigrams(term)]
+        if None in postings:
+            return []
+        # Sorting the keys puts the candidates back in list order
+        candidates = [_search_entries[key] for key in sorted(set.intersection(*postings))]
+
+    # The index only narrows things down, so confirm each candidate for real
+    return [contact for contact, name, phone in candidates if term in name or term in phone]
+
+
 # --- Input Validation Helpers ---
 
 def get_validated_input(prompt, validation_type='text'):
-    """Prompts user and applies simple regex validation for email/phone."""
+    """Prompts user and applies simple format validation for email/phone."""
     while True:
         value = input(prompt).strip()
         if not value:
@@ -62,13 +193,13 @@ def get_validated_input(prompt, validation_type='text'):
 
         if validation_type == 'email':
             # Simple email regex check
-            if not re.match(r"[^@]+@[^@]+\.[^@]+", value):
+            if EMAIL_PATTERN.match(value) is None:
                 print("Invalid email format. Please re-enter.")
                 continue
 
         elif validation_type == 'phone':
-            # Simple phone regex check (digits, spaces, dashes, parentheses)
-            if not re.match(r"^[0-9()\s-]+$", value):
+            # Simple phone check (digits, spaces, dashes, parentheses)
+            if value.translate(PHONE_STRIP_TABLE):
                 print("Invalid phone format. Use only numbers and common delimiters.")
                 continue
 
@@ -79,6 +210,7 @@ def get_validated_input(prompt, validation_type='text'):
 
 def add_contact(contacts_list):
     """Prompts the user for all details and adds a new contact."""
+    ensure_search_index(contacts_list)
     print("\n--- Adding New Contact ---")
 
     new_contact = {}
@@ -88,7 +220,8 @@ def add_contact(contacts_list):
     new_contact['address'] = input("Enter Address (optional): ").strip()
 
     contacts_list.append(new_contact)
-    save_contacts(contacts_list)
+    append_search_entry(new_contact)
+    write_back.mark_dirty(contacts_list)
     print(f"Contact '{new_contact['name']}' added successfully.")
 
 
@@ -98,11 +231,13 @@ def view_contact_list(contacts_list):
         print("\nYour Contact Book is empty!")
         return
 
-    print("\n--- 👥 Saved Contact List ---")
+    # Build the whole listing first and write it out in one go
+    lines = ["\n--- 👥 Saved Contact List ---\n"]
     # Using enumerate gives us a clean 1-based index for the user
     for i, contact in enumerate(contacts_list, 1):
-        print(f"[{i:02d}] Name: {contact['name']:<20} | Phone: {contact['phone']}")
-    print("----------------------------------\n")
+        lines.append(f"[{i:02d}] Name: {contact['name']:<20} | Phone: {contact['phone']}\n")
+    lines.append("----------------------------------\n\n")
+    sys.stdout.write("".join(lines))
 
 
 def search_contact(contacts_list):
@@ -113,27 +248,29 @@ def search_contact(contacts_list):
 
     term = input("Enter Name or Phone Number to search: ").strip().lower()
 
+    ensure_search_index(contacts_list)
+
     # Filter the list based on the search term
-    found_contacts = [
-        c for c in contacts_list
-        if term in c['name'].lower() or term in c['phone'].replace(' ', '').replace('-', '')
-    ]
+    found_contacts = find_matches(term)
 
     if not found_contacts:
         print(f"No contacts found matching '{term}'.")
         return
 
-    print(f"\n--- {len(found_contacts)} Contact(s) Found ---")
+    # Build the whole listing first and write it out in one go
+    lines = [f"\n--- {len(found_contacts)} Contact(s) Found ---\n"]
     for contact in found_contacts:
-        print(f"\nName:    {contact['name']}")
-        print(f"Phone:   {contact['phone']}")
-        print(f"Email:   {contact['email'] if contact['email'] else 'N/A'}")
-        print(f"Address: {contact['address'] if contact['address'] else 'N/A'}")
-    print("------------------------------------------\n")
+        lines.append(f"\nName:    {contact['name']}\n")
+        lines.append(f"Phone:   {contact['phone']}\n")
+        lines.append(f"Email:   {contact['email'] if contact['email'] else 'N/A'}\n")
+        lines.append(f"Address: {contact['address'] if contact['address'] else 'N/A'}\n")
+    lines.append("------------------------------------------\n\n")
+    sys.stdout.write("".join(lines))
 
 
 def update_contact(contacts_list):
     """Allows the user to select a contact and update any of its fields."""
+    ensure_search_index(contacts_list)
     view_contact_list(contacts_list)
     if not contacts_list:
         return
@@ -168,12 +305,14 @@ def update_contact(contacts_list):
             except Exception:  # Handle the case where the user entered an empty line after the first input
                 contact_to_update[field] = new_value
 
-    save_contacts(contacts_list)
+    replace_search_entry(contact_to_update)
+    write_back.mark_dirty(contacts_list)
     print(f"Contact '{contact_to_update['name']}' updated successfully.")
 
 
 def delete_contact(contacts_list):
     """Allows the user to select a contact and delete it."""
+    ensure_search_index(contacts_list)
     view_contact_list(contacts_list)
     if not contacts_list:
         return
@@ -191,7 +330,8 @@ def delete_contact(contacts_list):
         return
 
     deleted_contact = contacts_list.pop(contact_index)
-    save_contacts(contacts_list)
+    remove_search_entry(deleted_contact)
+    write_back.mark_dirty(contacts_list)
     print(f"Contact '{deleted_contact['name']}' successfully deleted.")
 
 
@@ -202,6 +342,10 @@ def main_menu():
 
     # Load contacts once at the start of the application
     contacts = load_contacts()
+    # Make sure any still-buffered changes reach the disk on a normal exit
+    atexit.register(write_back.flush, contacts)
+
+    _input = input  # Local lookup is cheaper inside the menu loop
 
     while True:
         print("\n=====Personal Contact Manager =====")
@@ -213,7 +357,7 @@ def main_menu():
         print("6. Exit")
         print("=======================================")
 
-        choice = input("Enter your choice (1-6): ").strip()
+        choice = _input("Enter your choice (1-6): ").strip()
 
         if choice == '1':
             view_contact_list(contacts)
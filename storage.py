@@ -0,0 +1,68 @@
+"""File helpers shared by the contact book and the to-do list."""
+import os
+import time
+
+
+def read_file(path):
+    """Reads the whole file at path as bytes, sized up front from fstat."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while size > 0:
+            # os.read may return less than asked, so keep going until done
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def write_file(path, data):
+    """Writes the given bytes to path with as few write() calls as possible."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than asked, so keep going until done
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+# --- Write-back Buffering ---
+# Changes are kept in memory and only written out once enough of them pile up
+# or enough time has passed, instead of rewriting the whole file on every edit.
+DIRTY_THRESHOLD = 16   # Unsaved changes allowed before forcing a save
+FLUSH_INTERVAL = 5.0   # Seconds allowed between saves while changes are pending
+
+
+class WriteBack:
+    """Tracks unsaved changes to a list and decides when to call its save function."""
+
+    def __init__(self, save, threshold=DIRTY_THRESHOLD, interval=FLUSH_INTERVAL):
+        self.save = save
+        self.threshold = threshold
+        self.interval = interval
+        self.dirty_count = 0
+        self.last_flush = time.monotonic()
+
+    def mark_clean(self):
+        """Resets the pending-change counter after a successful save."""
+        self.dirty_count = 0
+        self.last_flush = time.monotonic()
+
+    def mark_dirty(self, items):
+        """Records a change and saves only once the batch threshold or interval is hit."""
+        self.dirty_count += 1
+        if self.dirty_count >= self.threshold or time.monotonic() - self.last_flush > self.interval:
+            self.save(items)
+
+    def flush(self, items):
+        """Saves the items only if there are changes that have not been written yet."""
+        if self.dirty_count:
+            self.save(items)
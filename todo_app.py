@@ -1,42 +1,126 @@
+import atexit
+import bisect
 import json
-import os
-from datetime import datetime
+import sys
+import time
+from datetime import datetime, timedelta
+
+from storage import WriteBack, read_file, write_file
+
+try:
+    import orjson # Optional: a much faster JSON encoder/decoder written in Rust
+except ImportError:
+    orjson = None
 
 # --- Configuration and Data Storage ---
 TODO_FILE = "my_personal_todo_list.json"
 DATE_FORMAT = "%Y-%m-%d"
 
+# Next ID to hand out; worked out once at load time and then just counted up
+_next_id = 1
+# Tasks keyed by their ID, kept in step with the task list for quick lookups
+_tasks_by_id = {}
+# The task list that table describes; add/delete keep it in step
+_indexed_tasks = None
+# IDs that more than one task shares (only possible in hand-edited files)
+_duplicate_ids = set()
+# Today's date string, reused until the local clock passes midnight
+_today = ""
+_today_expires = 0.0
+
 # --- Utility Functions ---
 
 def load_tasks():
-    if not os.path.exists(TODO_FILE):
-        return []
-    try:
-        with open(TODO_FILE, 'r') as file:
+    tasks = read_tasks_file()
+    reset_next_id(tasks)
+    rebuild_id_index(tasks)
+    return tasks
 
-            content = file.read()
-            if not content:
-                return []
-            return json.loads(content)
+def read_tasks_file():
+    """Reads the raw list of tasks from the JSON file."""
+    try:
+        # Read the raw bytes straight off the fd; both JSON backends accept bytes
+        content = read_file(TODO_FILE)
+        if not content:
+            return []
+        return decode_tasks(content)
+    except FileNotFoundError:
+        return []  # First run, nothing saved yet
     except Exception as e:
         print(f"Error loading tasks: {e}. Starting with an empty list.")
         return []
 
+def encode_tasks(tasks_list):
+    """Serializes the tasks to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(tasks_list, option=orjson.OPT_INDENT_2)
+    return json.dumps(tasks_list, indent=4).encode('utf-8')
+
+def decode_tasks(content):
+    """Parses JSON text or bytes back into the task list, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 def save_tasks(tasks_list):
     """Saves the current list of tasks to the JSON file."""
     try:
-        with open(TODO_FILE, 'w') as file:
-            json.dump(tasks_list, file, indent=4)
+        # Serialize everything up front so the file gets a single write
+        data = encode_tasks(tasks_list)
+        write_file(TODO_FILE, data)
+        write_back.mark_clean()
     except Exception as e:
         print(f"Critical Error: Could not save tasks! {e}")
 
-def get_next_id(tasks_list):
-    """Calculates the next unique ID for a new task."""
-    if not tasks_list:
-        return 1
+# Batches edits so the file is rewritten once per batch, not on every change
+write_back = WriteBack(save_tasks)
+
+def reset_next_id(tasks_list):
+    """Sets the ID counter to one past the highest ID in the given tasks."""
+    global _next_id
     # Find the maximum existing ID and add 1
-    max_id = max(task.get('id', 0) for task in tasks_list)
-    return max_id + 1
+    # Tasks without an ID (hand-edited files) are left out, as in rebuild_id_index
+    _next_id = max((task['id'] for task in tasks_list if 'id' in task), default=0) + 1
+
+def get_next_id(tasks_list):
+    """Hands out the next unique ID for a new task."""
+    global _next_id
+    # IDs only ever count up, so deleting a task never frees its ID for reuse
+    task_id = _next_id
+    _next_id += 1
+    return task_id
+
+def today_str():
+    """Returns today's date formatted with DATE_FORMAT, recomputed once per day."""
+    global _today, _today_expires
+    now = time.time()
+    if now >= _today_expires:
+        today = datetime.fromtimestamp(now)
+        _today = today.strftime(DATE_FORMAT)
+        midnight = (today + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        _today_expires = midnight.timestamp()
+    return _today
+
+def rebuild_id_index(tasks_list):
+    """Recomputes the ID lookup table for the whole task list."""
+    global _indexed_tasks
+    _indexed_tasks = tasks_list
+    _tasks_by_id.clear()
+    _duplicate_ids.clear()
+    for task in tasks_list:
+        # Tasks without an ID can't be looked up; with duplicates the first one
+        # wins, as it did with the old linear search
+        if 'id' in task:
+            if task['id'] in _tasks_by_id:
+                _duplicate_ids.add(task['id'])
+            else:
+                _tasks_by_id[task['id']] = task
+
+def ensure_id_index(tasks_list):
+    """Rebuilds the ID lookup table if it was built for a different task list."""
+    # The table only describes the list it was built from
+    if tasks_list is not _indexed_tasks:
+        rebuild_id_index(tasks_list)
 
 # --- Core To-Do Functions ---
 
@@ -58,15 +142,17 @@ def add_task(tasks_list):
         except ValueError:
             print(f"Invalid date format. Due date not set. Please use {DATE_FORMAT}.")
 
+    ensure_id_index(tasks_list)
     new_task = {
         'id': get_next_id(tasks_list),
         'description': description,
         'done': False,
-        'created_on': datetime.now().strftime(DATE_FORMAT),
+        'created_on': today_str(),
         'due_date': due_date
     }
     tasks_list.append(new_task)
-    save_tasks(tasks_list)
+    _tasks_by_id[new_task['id']] = new_task
+    write_back.mark_dirty(tasks_list)
     print(f"Task #{new_task['id']} added successfully.")
 
 def view_tasks(tasks_list):
@@ -75,44 +161,79 @@ def view_tasks(tasks_list):
         print("\n Your To-Do List is empty! Time to add some tasks.")
         return
 
-    print("\n--- Current To-Do List ---")
+    # Build the whole listing first and write it out in one go
+    lines = ["\n--- Current To-Do List ---\n"]
     for task in tasks_list:
         status = "DONE" if task['done'] else "☐ PENDING"
         due = f" (Due: {task['due_date']})" if task.get('due_date') else ""
-        print(f"[{task['id']}] {status} | {task['description']}{due}")
-    print("------------------------------\n")
+        lines.append(f"[{task['id']}] {status} | {task['description']}{due}\n")
+    lines.append("------------------------------\n\n")
+    sys.stdout.write("".join(lines))
 
 def find_task_by_id(tasks_list, task_id):
     """Helper to find a task dictionary by its unique ID."""
+    ensure_id_index(tasks_list)
     try:
-        task_id = int(task_id)
-        return next((task for task in tasks_list if task['id'] == task_id), None)
+        return _tasks_by_id.get(int(task_id))
     except ValueError:
         return None
 
+def find_task_position(tasks_list, task):
+    """Finds where a task sits in the list (None if it isn't there), scanning only when needed."""
+    # IDs are handed out in increasing order and deletes keep the order intact,
+    # so the list is normally sorted by ID and can be binary searched.
+    try:
+        pos = bisect.bisect_left(tasks_list, task['id'], key=lambda t: t['id'])
+    except (KeyError, TypeError):
+        pos = -1  # A task without a usable ID, so the order can't be trusted
+    if 0 <= pos < len(tasks_list) and tasks_list[pos] is task:
+        return pos
+    # The file was edited by hand and isn't sorted, so fall back to a scan
+    return next((i for i, t in enumerate(tasks_list) if t is task), None)
+
 def mark_task_done(tasks_list):
     """Changes the 'done' status of a task."""
+    view_tasks(tasks_list) # Show tasks first for convenience
+    if not tasks_list:
+        return
+
     task_id = input("Enter the ID of the task to mark as DONE: ").strip()
     task = find_task_by_id(tasks_list, task_id)
 
     if task:
         task['done'] = True
-        save_tasks(tasks_list)
+        write_back.mark_dirty(tasks_list)
         print(f"Task #{task['id']} marked as done.")
     else:
         print(f"Task with ID '{task_id}' not found.")
 
 def delete_task(tasks_list):
     """Removes a task from the list using its unique ID."""
+    view_tasks(tasks_list) # Show tasks first for convenience
+    if not tasks_list:
+        return
+
     task_id = input("Enter the ID of the task to DELETE: ").strip()
     task = find_task_by_id(tasks_list, task_id)
+    position = find_task_position(tasks_list, task) if task else None
 
-    if task:
-        # Use list comprehension to create a new list without the deleted task
-        tasks_list[:] = [t for t in tasks_list if t['id'] != task['id']]
-        save_tasks(tasks_list)
+    if position is not None:
+        # Drop it from the lookup table and remove just that one entry from the list
+        del _tasks_by_id[task['id']]
+        del tasks_list[position]
+        if task['id'] in _duplicate_ids:
+            # Another task shares this ID, so let the table point at it next
+            _duplicate_ids.discard(task['id'])
+            rest = [t for t in tasks_list if t.get('id') == task['id']]
+            if rest:
+                _tasks_by_id[task['id']] = rest[0]
+                if len(rest) > 1:
+                    _duplicate_ids.add(task['id'])
+        write_back.mark_dirty(tasks_list)
         print(f"Task #{task['id']} successfully deleted.")
     else:
+        if task:
+            rebuild_id_index(tasks_list) # The table was stale, so resync it
         print(f"Task with ID '{task_id}' not found.")
 
 # --- Main Application Loop ---
@@ -120,6 +241,10 @@ def delete_task(tasks_list):
 def main_menu():
     """Displays the main menu and handles user input."""
     tasks = load_tasks()
+    # Make sure any still-buffered changes reach the disk on a normal exit
+    atexit.register(write_back.flush, tasks)
+
+    _input = input  # Local lookup is cheaper inside the menu loop
 
     while True:
         print("\n===== To-Do List Manager =====")
@@ -130,17 +255,15 @@ def main_menu():
         print("5. Exit")
         print("==============================")
 
-        choice = input("Enter your choice (1-5): ").strip()
+        choice = _input("Enter your choice (1-5): ").strip()
 
         if choice == '1':
             view_tasks(tasks)
         elif choice == '2':
             add_task(tasks)
         elif choice == '3':
-            view_tasks(tasks) # Show tasks first for convenience
             mark_task_done(tasks)
         elif choice == '4':
-            view_tasks(tasks) # Show tasks first for convenience
             delete_task(tasks)
         elif choice == '5':
             print("Saving and exiting. Goodbye!")